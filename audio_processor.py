@@ -4,12 +4,20 @@ Audio Processor for F5-TTS
 - Transcribe reference audio using Whisper AI
 - Generate audio using F5-TTS in 500-character chunks
 - Upload generated audio to Google Drive progressively
+- Shard chunks across GPUs when started with `accelerate launch`
 """
 
 import os
+import re
 import sys
+import queue
+import hashlib
+import threading
+import contextlib
+import concurrent.futures
 import torch
-import whisper
+import torchaudio
+from faster_whisper import WhisperModel
 import soundfile as sf
 import numpy as np
 from pathlib import Path
@@ -17,9 +25,39 @@ from typing import List, Optional, Tuple
 from tqdm import tqdm
 import time
 
+try:
+    from accelerate import Accelerator
+    from accelerate.utils import broadcast_object_list, gather_object
+    HAS_ACCELERATE = True
+except ImportError:
+    HAS_ACCELERATE = False
+
 # Import Google Drive manager
 from google_drive_manager import DriveManager
 
+# Sentence ending followed by a space or newline, used as a chunk split point
+_SENT_END = re.compile(r'[.!?][ \n]')
+
+# CFM.sample's default max_duration (mel frames); longer durations get clamped
+MAX_DURATION = 4096
+# Reference plus generated audio per forward pass, as in F5TTS.infer
+MAX_SECONDS = 22
+# Overlap between pieces of one chunk, as in F5TTS.infer
+CROSS_FADE_SECONDS = 0.15
+
+
+def _cross_fade(waves: List[torch.Tensor], fade: int) -> torch.Tensor:
+    """Join 1-D waveforms with a linear cross-fade at each boundary"""
+    out = waves[0]
+    for wave in waves[1:]:
+        n = min(fade, len(out), len(wave))
+        if n <= 0:
+            out = torch.cat([out, wave])
+            continue
+        ramp = torch.linspace(0, 1, n)
+        out = torch.cat([out[:-n], out[-n:] * (1 - ramp) + wave[:n] * ramp, wave[n:]])
+    return out
+
 class Colors:
     OKGREEN = '\033[92m'
     WARNING = '\033[93m'
@@ -29,10 +67,29 @@ class Colors:
     HEADER = '\033[95m'
     BOLD = '\033[1m'
 
+# Plain output when redirected to a log file or when NO_COLOR is set
+if os.environ.get('NO_COLOR') or not sys.stdout.isatty():
+    for _name in [k for k in vars(Colors) if k.isupper()]:
+        setattr(Colors, _name, '')
+
 
 class AudioProcessor:
-    def __init__(self, base_dir: Path = Path('/workspace/f5tts_project')):
+    def __init__(self, base_dir: Path = Path('/workspace/f5tts_project'),
+                 batch_size: int = 4, nfe_step: int = 32, ode_method: str = 'euler',
+                 compile_models: bool = True, use_bf16: bool = False):
         self.base_dir = base_dir
+        self.batch_size = max(1, batch_size)
+        self.nfe_step = nfe_step
+        self.ode_method = ode_method
+        self.compile_models = compile_models
+        self.use_bf16 = use_bf16
+        # Optional pause between batches (e.g. for thermal throttling); off by default
+        try:
+            self.chunk_sleep = max(0.0, float(os.environ.get('F5TTS_CHUNK_SLEEP', '0')))
+        except ValueError:
+            print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} Ignoring invalid F5TTS_CHUNK_SLEEP="
+                  f"{os.environ['F5TTS_CHUNK_SLEEP']!r}; expected seconds")
+            self.chunk_sleep = 0.0
         self.input_dir = base_dir / 'input'
         self.output_dir = base_dir / 'output' / 'generated_audio'
         self.reference_audio_dir = base_dir / 'input' / 'reference_audio'
@@ -43,27 +100,87 @@ class AudioProcessor:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
+        # Multi-GPU: one process per GPU, each generating its own slice of chunks
+        self.accelerator = None
+        if HAS_ACCELERATE and int(os.environ.get('WORLD_SIZE', '1')) > 1:
+            self.accelerator = Accelerator()
+
         # Initialize models
         self.whisper_model = None
+        self.whisper_model_size = None
         self.f5tts_model = None
-
-        # Google Drive manager
+        # Set to torch.bfloat16 once the DiT weights have been cast
+        self.autocast_dtype = None
+
+        # Serialises lazy model loads and reference preparation across worker threads
+        self._model_lock = threading.RLock()
+        # Serialises sampling and vocoding on the shared (compiled) model
+        self._gpu_lock = threading.Lock()
+        # (transformer, vocoder) before torch.compile; None when running eager
+        self._eager_parts = None
+
+        # Preprocessed reference audio, reused across chunks and scripts
+        self._ref_cache_key = None
+        self._ref_cache = None
+        # When set, reference mels are also persisted here and reused across runs
+        self.ref_embed_cache_dir: Optional[Path] = None
+
+        # Google Drive manager; uploads run in the background while the GPU generates.
+        # process_script queues finished files, the worker hands them to the pool.
         self.drive_manager = None
+        self._upload_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        self._upload_q = queue.Queue()
+        # Files whose upload failed since the last flush_uploads()
+        self._upload_failures: List[Path] = []
+        self._upload_lock = threading.Lock()
+        threading.Thread(target=self._upload_worker, daemon=True).start()
 
         print(f"{Colors.OKGREEN}[INIT]{Colors.ENDC} AudioProcessor initialized")
         print(f"  Base dir: {self.base_dir}")
         print(f"  Reference audio: {self.reference_audio_dir}")
         print(f"  Output dir: {self.output_dir}")
-
-    def load_whisper_model(self, model_size: str = 'base'):
-        """Load Whisper AI model for transcription"""
-        print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Loading Whisper model ({model_size})...")
-        try:
-            self.whisper_model = whisper.load_model(model_size)
-            print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Whisper model loaded")
-        except Exception as e:
-            print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Failed to load Whisper: {str(e)}")
-            raise
+        print(f"  Batch size: {self.batch_size}")
+        print(f"  Sampling: {self.nfe_step} NFE steps, {self.ode_method} solver")
+        if self.accelerator:
+            print(f"  Process: {self.accelerator.process_index + 1}/{self.accelerator.num_processes} "
+                  f"on {self.accelerator.device}")
+
+    def load_whisper_model(self, model_size: str = 'tiny', cache_dir: Optional[Path] = None):
+        """Load Whisper AI model for transcription, optionally from a persistent model cache"""
+        with self._model_lock:
+            if self.whisper_model is not None and self.whisper_model_size == model_size:
+                return
+
+            print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Loading Whisper model ({model_size})...")
+            try:
+                if self.accelerator:
+                    device = self.accelerator.device.type
+                    device_index = self.accelerator.device.index or 0
+                else:
+                    device = "cuda" if torch.cuda.is_available() else "cpu"
+                    device_index = 0
+
+                # CTranslate2 backend: INT8 weights with FP16 compute on GPU, pure INT8 on CPU
+                compute_type = "int8_float16" if device == "cuda" else "int8"
+                kwargs = dict(device=device, device_index=device_index, compute_type=compute_type)
+
+                model = None
+                if cache_dir is not None:
+                    kwargs['download_root'] = str(cache_dir)
+                    try:
+                        # Already fetched on an earlier run: load without contacting the Hub
+                        model = WhisperModel(model_size, local_files_only=True, **kwargs)
+                    except Exception:
+                        model = None
+                if model is None:
+                    model = WhisperModel(model_size, **kwargs)
+
+                self.whisper_model = model
+                self.whisper_model_size = model_size
+                print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Whisper model loaded on {device} ({compute_type})")
+            except Exception as e:
+                print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Failed to load Whisper: {str(e)}")
+                raise
 
     def transcribe_audio(self, audio_path: Path) -> str:
         """Transcribe audio file using Whisper"""
@@ -72,8 +189,8 @@ class AudioProcessor:
 
         print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Transcribing: {audio_path.name}")
         try:
-            result = self.whisper_model.transcribe(str(audio_path))
-            transcription = result['text'].strip()
+            segments, _ = self.whisper_model.transcribe(str(audio_path), beam_size=1, vad_filter=True)
+            transcription = "".join(segment.text for segment in segments).strip()
             print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Transcription complete")
             print(f"  Text: {transcription[:100]}..." if len(transcription) > 100 else f"  Text: {transcription}")
             return transcription
@@ -83,18 +200,65 @@ class AudioProcessor:
 
     def load_f5tts_model(self):
         """Load F5-TTS model"""
-        print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Loading F5-TTS model...")
-        try:
-            # Import F5-TTS components
-            sys.path.insert(0, str(self.base_dir / 'F5-TTS'))
-            from f5_tts.api import F5TTS
+        with self._model_lock:
+            if self.f5tts_model is not None:
+                return
+
+            print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Loading F5-TTS model...")
+            try:
+                # Import F5-TTS components
+                sys.path.insert(0, str(self.base_dir / 'F5-TTS'))
+                from f5_tts.api import F5TTS
+
+                device = str(self.accelerator.device) if self.accelerator else None
+                self.f5tts_model = F5TTS(ode_method=self.ode_method, device=device)
+                print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} F5-TTS model loaded")
+            except Exception as e:
+                print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Failed to load F5-TTS: {str(e)}")
+                print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} Make sure F5-TTS is properly installed")
+                raise
+
+            if self.use_bf16 and torch.cuda.is_available() and torch.cuda.is_bf16_supported():
+                # Opt-in: F5-TTS already runs FP16 on CUDA, so BF16 only trades mantissa
+                # bits for FP32's exponent range (useful if FP16 overflows)
+                self.f5tts_model.ema_model.transformer.to(torch.bfloat16)
+                self.autocast_dtype = torch.bfloat16
+                print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} F5-TTS DiT running in BF16")
+
+            if self.compile_models:
+                self.compile_f5tts_model()
+
+    def compile_f5tts_model(self):
+        """Compile the DiT backbone and vocoder; the first chunk pays the graph build"""
+        print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Compiling F5-TTS model...")
+
+        cfm = self.f5tts_model.ema_model
+        vocoder = self.f5tts_model.vocoder
+        # Eager modules, restored by _use_eager_model if compiled execution fails
+        self._eager_parts = (cfm.transformer, vocoder)
 
-            self.f5tts_model = F5TTS()
-            print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} F5-TTS model loaded")
+        try:
+            # Chunk durations differ per batch, so compile with dynamic shapes
+            cfm.transformer = torch.compile(cfm.transformer, dynamic=True)
+            if getattr(self.f5tts_model, 'mel_spec_type', 'vocos') == 'bigvgan':
+                self.f5tts_model.vocoder = torch.compile(vocoder, dynamic=True)
+            else:
+                vocoder.decode = torch.compile(vocoder.decode, dynamic=True)
         except Exception as e:
-            print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Failed to load F5-TTS: {str(e)}")
-            print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} Make sure F5-TTS is properly installed")
-            raise
+            print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} Could not compile F5-TTS, using eager mode: {str(e)}")
+            self._use_eager_model()
+
+    def _use_eager_model(self) -> bool:
+        """Undo compile_f5tts_model; returns False if the model wasn't compiled"""
+        with self._model_lock:
+            if self._eager_parts is None:
+                return False
+            transformer, vocoder = self._eager_parts
+            self.f5tts_model.ema_model.transformer = transformer
+            self.f5tts_model.vocoder = vocoder
+            vars(vocoder).pop('decode', None)
+            self._eager_parts = None
+            return True
 
     def chunk_text(self, text: str, max_chars: int = 500) -> List[str]:
         """Split text into chunks of max_chars, breaking at sentence boundaries"""
@@ -117,59 +281,284 @@ class AudioProcessor:
             chunk = text[current_pos:end_pos]
 
             # Try to find last sentence ending
-            for delimiter in ['. ', '! ', '? ', '.\n', '!\n', '?\n']:
-                last_delim = chunk.rfind(delimiter)
-                if last_delim != -1:
-                    end_pos = current_pos + last_delim + len(delimiter)
-                    break
+            last_match = None
+            for last_match in _SENT_END.finditer(chunk):
+                pass
+            if last_match is not None:
+                end_pos = current_pos + last_match.end()
 
             chunks.append(text[current_pos:end_pos].strip())
             current_pos = end_pos
 
         return chunks
 
+    @torch.inference_mode()
+    def prepare_reference(self, reference_audio: Path,
+                          reference_text: str) -> Tuple[torch.Tensor, int, torch.Tensor, str]:
+        """Preprocess the reference audio once and cache its mel spectrogram"""
+        # Size and mtime catch a new recording downloaded over the same path
+        stat = reference_audio.stat()
+        cache_key = (str(reference_audio), stat.st_mtime_ns, stat.st_size, reference_text)
+        with self._model_lock:
+            if self._ref_cache_key == cache_key:
+                return self._ref_cache
+
+            self.load_f5tts_model()
+
+            from f5_tts.infer.utils_infer import (
+                hop_length, preprocess_ref_audio_text, target_rms, target_sample_rate
+            )
+
+            device = torch.device(self.f5tts_model.device)
+
+            disk_cache = None
+            if self.ref_embed_cache_dir is not None:
+                disk_cache = self.ref_embed_cache_dir / f"{self._ref_embed_key(reference_audio, reference_text)}.pt"
+                try:
+                    cached = torch.load(disk_cache, map_location=device, weights_only=True)
+                    print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Using cached reference mel for {reference_audio.name}")
+                    self._ref_cache_key = cache_key
+                    self._ref_cache = (cached['ref_mel'], cached['ref_audio_len'], cached['rms'], cached['ref_text'])
+                    return self._ref_cache
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} Ignoring unreadable reference cache: {str(e)}")
+
+            print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Preparing reference audio: {reference_audio.name}")
+
+            # Same preprocessing as F5TTS.infer, done once instead of per chunk
+            ref_file, ref_text = preprocess_ref_audio_text(str(reference_audio), reference_text)
+            audio, sr = torchaudio.load(ref_file)
+            if audio.shape[0] > 1:
+                audio = torch.mean(audio, dim=0, keepdim=True)
+            rms = torch.sqrt(torch.mean(torch.square(audio)))
+            if rms < target_rms:
+                audio = audio * target_rms / rms
+            if sr != target_sample_rate:
+                audio = torchaudio.transforms.Resample(sr, target_sample_rate)(audio)
+
+            # Stage through pinned memory so the H2D copy is asynchronous
+            if device.type == 'cuda':
+                audio = audio.pin_memory().to(device, non_blocking=True)
+            else:
+                audio = audio.to(device)
+
+            if len(ref_text[-1].encode('utf-8')) == 1:
+                ref_text = ref_text + ' '
+
+            # CFM.sample accepts a precomputed (b, n, d) mel as cond, skipping the STFT
+            ref_mel = self.f5tts_model.ema_model.mel_spec(audio).permute(0, 2, 1)
+            ref_audio_len = audio.shape[-1] // hop_length
+
+            if disk_cache is not None:
+                try:
+                    disk_cache.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_file = disk_cache.with_suffix(f'.{os.getpid()}.tmp')
+                    torch.save({
+                        'ref_mel': ref_mel.cpu(),
+                        'ref_audio_len': ref_audio_len,
+                        'rms': rms,
+                        'ref_text': ref_text,
+                    }, tmp_file)
+                    os.replace(tmp_file, disk_cache)
+                except OSError as e:
+                    print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} Could not save reference cache: {str(e)}")
+
+            self._ref_cache_key = cache_key
+            self._ref_cache = (ref_mel, ref_audio_len, rms, ref_text)
+            return self._ref_cache
+
+    def _ref_embed_key(self, reference_audio: Path, reference_text: str) -> str:
+        """Hash of the reference audio bytes, its transcript and the mel settings"""
+        digest = hashlib.sha256()
+        with open(reference_audio, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        digest.update(f"\0{reference_text}\0{self.f5tts_model.mel_spec_type}".encode('utf-8'))
+        return digest.hexdigest()
+
     def generate_audio_chunk(self, text: str, reference_audio: Path,
                            reference_text: str, output_path: Path) -> bool:
         """Generate audio for a single text chunk using F5-TTS"""
-        if self.f5tts_model is None:
-            self.load_f5tts_model()
+        return self.generate_audio_batch([text], reference_audio, reference_text, [output_path])[0]
+
+    @torch.inference_mode()
+    def generate_audio_batch(self, texts: List[str], reference_audio: Path,
+                             reference_text: str, output_paths: List[Path],
+                             max_batch: Optional[int] = None) -> List[bool]:
+        """Generate audio for several text chunks in a single F5-TTS forward pass"""
+        max_batch = max_batch or self.batch_size
+        # No-op once loaded; waits if another thread is still loading/compiling
+        self.load_f5tts_model()
 
         try:
-            print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Generating audio chunk...")
-            print(f"  Text: {text[:50]}..." if len(text) > 50 else f"  Text: {text}")
-
-            # Generate audio using F5-TTS
-            audio_data = self.f5tts_model.infer(
-                ref_file=str(reference_audio),
-                ref_text=reference_text,
-                gen_text=text,
+            from f5_tts.infer.utils_infer import (
+                cfg_strength, hop_length, sway_sampling_coef, target_rms, target_sample_rate
             )
-
-            # Save audio file
-            sf.write(str(output_path), audio_data, 24000)  # F5-TTS typically uses 24kHz
-
-            print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Audio chunk generated: {output_path.name}")
-            return True
+            from f5_tts.infer.utils_infer import chunk_text as f5_chunk_text
+            from f5_tts.model.utils import convert_char_to_pinyin
+
+            print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Generating {len(texts)} audio chunk(s)...")
+            for text in texts:
+                print(f"  Text: {text[:50]}..." if len(text) > 50 else f"  Text: {text}")
+
+            model = self.f5tts_model.ema_model
+            vocoder = self.f5tts_model.vocoder
+            device = self.f5tts_model.device
+
+            ref_mel, ref_audio_len, rms, ref_text = self.prepare_reference(reference_audio, reference_text)
+
+            # Re-split each chunk the way F5TTS.infer does, so reference plus generated
+            # audio stays within what the model was trained on
+            ref_text_len = len(ref_text.encode('utf-8'))
+            ref_seconds = ref_audio_len * hop_length / target_sample_rate
+            max_chars = max(1, int(ref_text_len / ref_seconds * (MAX_SECONDS - ref_seconds)))
+            pieces = [
+                (i, piece)
+                for i, text in enumerate(texts)
+                for piece in (f5_chunk_text(text, max_chars=max_chars) or [text])
+            ]
+
+            autocast = (
+                torch.autocast(device_type='cuda', dtype=self.autocast_dtype)
+                if self.autocast_dtype is not None else contextlib.nullcontext()
+            )
+            is_bigvgan = getattr(self.f5tts_model, 'mel_spec_type', 'vocos') == 'bigvgan'
+            waves = [[] for _ in texts]
+
+            # Pieces go through in batches of max_batch; CFM.sample pads every item to
+            # the longest duration and builds the attention mask when batch > 1
+            for start in range(0, len(pieces), max_batch):
+                batch = pieces[start:start + max_batch]
+
+                # Estimate each piece's duration from the reference speaking rate
+                durations = [
+                    min(MAX_DURATION,
+                        ref_audio_len + int(ref_audio_len / ref_text_len * len(piece.encode('utf-8'))))
+                    for _, piece in batch
+                ]
+
+                # One script on the GPU at a time; other workers keep reading,
+                # merging and uploading meanwhile
+                with self._gpu_lock:
+                    with autocast:
+                        generated, _ = model.sample(
+                            cond=ref_mel.expand(len(batch), -1, -1),
+                            text=convert_char_to_pinyin([ref_text + piece for _, piece in batch]),
+                            duration=torch.tensor(durations, dtype=torch.long, device=device),
+                            steps=self.nfe_step,
+                            cfg_strength=cfg_strength,
+                            sway_sampling_coef=sway_sampling_coef,
+                            max_duration=MAX_DURATION,
+                        )
+
+                    for row, (i, _) in enumerate(batch):
+                        mel = generated[row, ref_audio_len:durations[row], :].unsqueeze(0)
+                        mel = mel.permute(0, 2, 1).to(torch.float32)
+                        wave = vocoder(mel) if is_bigvgan else vocoder.decode(mel)
+                        waves[i].append(wave.squeeze().float().cpu())
+                    del generated
+
+            results = []
+            fade = int(CROSS_FADE_SECONDS * target_sample_rate)
+            for i, output_path in enumerate(output_paths):
+                wave = _cross_fade(waves[i], fade)
+                if rms < target_rms:
+                    wave = wave * float(rms) / target_rms
+
+                # Save audio file
+                sf.write(str(output_path), wave.numpy(), target_sample_rate)
+                print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Audio chunk generated: {output_path.name}")
+                results.append(True)
+
+            return results
 
         except Exception as e:
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+            # A compile/graph failure is not the batch's fault: log it and rerun eagerly
+            if not isinstance(e, torch.cuda.OutOfMemoryError) and self._use_eager_model():
+                print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} Compiled F5-TTS failed ({str(e)}), "
+                      f"falling back to eager mode")
+                return self.generate_audio_batch(texts, reference_audio, reference_text,
+                                                 output_paths, max_batch=max_batch)
+
+            # Retry before giving up on the whole batch: smaller forward passes first
+            # (OOM), then chunk by chunk so one bad chunk doesn't drop its neighbours
+            if max_batch > 1:
+                print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} Generation failed ({str(e)}), "
+                      f"retrying with batch size {max_batch // 2}")
+                return self.generate_audio_batch(texts, reference_audio, reference_text,
+                                                 output_paths, max_batch=max_batch // 2)
+            if len(texts) > 1:
+                print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} Generation failed ({str(e)}), "
+                      f"retrying {len(texts)} chunks one at a time")
+                return [
+                    self.generate_audio_batch([text], reference_audio, reference_text, [path], max_batch=1)[0]
+                    for text, path in zip(texts, output_paths)
+                ]
+
             print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Failed to generate audio: {str(e)}")
-            return False
+            return [False] * len(texts)
 
     def merge_audio_files(self, audio_files: List[Path], output_path: Path) -> bool:
         """Merge multiple audio files into one"""
         try:
             print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Merging {len(audio_files)} audio files...")
 
-            audio_segments = []
-            for audio_file in audio_files:
-                audio, sr = sf.read(str(audio_file))
-                audio_segments.append(audio)
-
-            # Concatenate audio
-            merged_audio = np.concatenate(audio_segments)
-
-            # Save merged audio
-            sf.write(str(output_path), merged_audio, sr)
+            # Header-only reads: every chunk must be mono at the output sample rate
+            infos = [sf.info(str(audio_file)) for audio_file in audio_files]
+            sr = infos[0].samplerate
+            for audio_file, info in zip(audio_files, infos):
+                if info.samplerate != sr or info.channels != 1:
+                    raise ValueError(f"{audio_file.name} is not mono {sr} Hz audio")
+
+            # A few buffers sized for the longest chunk are recycled between the reader
+            # and the writer, so no per-chunk arrays are allocated
+            max_frames = max(info.frames for info in infos)
+            free_buffers = queue.Queue()
+            for _ in range(3):
+                free_buffers.put(np.empty(max_frames, dtype=np.float32))
+
+            # Read chunk N+1 on a background thread while chunk N is written
+            prefetched = queue.Queue()
+            stop = threading.Event()
+
+            def reader():
+                try:
+                    for audio_file, info in zip(audio_files, infos):
+                        buffer = free_buffers.get()
+                        if buffer is None or stop.is_set():
+                            return  # Writer gave up
+                        sf.read(str(audio_file), dtype='float32', out=buffer[:info.frames])
+                        prefetched.put((buffer, info.frames))
+                except Exception as e:
+                    prefetched.put(e)
+                    return
+                prefetched.put(None)
+
+            reader_thread = threading.Thread(target=reader, daemon=True)
+            reader_thread.start()
+
+            try:
+                with sf.SoundFile(str(output_path), 'w', samplerate=sr, channels=1,
+                                  subtype='PCM_16') as out:
+                    while True:
+                        item = prefetched.get()
+                        if item is None:
+                            break
+                        if isinstance(item, Exception):
+                            raise item
+                        buffer, frames = item
+                        out.write(buffer[:frames])
+                        free_buffers.put(buffer)
+            finally:
+                # Wake the reader if it is waiting for a buffer, so it never outlives a failed merge
+                stop.set()
+                free_buffers.put(None)
+                reader_thread.join()
 
             print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Merged audio saved: {output_path.name}")
             return True
@@ -178,6 +567,41 @@ class AudioProcessor:
             print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Failed to merge audio: {str(e)}")
             return False
 
+    def _upload_worker(self):
+        """Feed queued (path, folder_id) uploads to the upload pool"""
+        while True:
+            file_path, folder_id = self._upload_q.get()
+            try:
+                future = self._upload_pool.submit(self.drive_manager.upload_file, file_path, folder_id)
+            except Exception as e:
+                print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Failed to queue upload {file_path.name}: {str(e)}")
+                self._upload_done(file_path, ok=False)
+                continue
+            future.add_done_callback(
+                lambda f, path=file_path: self._upload_done(
+                    path, ok=f.exception() is None and f.result() is not None
+                )
+            )
+
+    def _upload_done(self, file_path: Path, ok: bool):
+        """Record an upload's outcome and mark its queue entry finished"""
+        if not ok:
+            with self._upload_lock:
+                self._upload_failures.append(file_path)
+        self._upload_q.task_done()
+
+    def flush_uploads(self) -> int:
+        """Block until every queued Drive upload has finished; returns the number that failed"""
+        if self._upload_q.unfinished_tasks:
+            print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Waiting for Drive uploads to finish...")
+        self._upload_q.join()
+
+        with self._upload_lock:
+            failed, self._upload_failures = self._upload_failures, []
+        for file_path in failed:
+            print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Not uploaded: {file_path.name}")
+        return len(failed)
+
     def process_script(self, script_path: Path, reference_audio: Path,
                       reference_text: str, upload_to_drive: bool = True,
                       drive_folder_id: Optional[str] = None) -> List[Path]:
@@ -196,32 +620,58 @@ class AudioProcessor:
         chunks = self.chunk_text(script_text, max_chars=500)
         print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Split into {len(chunks)} chunks")
 
+        # Preprocess reference audio once for all chunks
+        self.prepare_reference(reference_audio, reference_text)
+
         # Generate audio for each chunk
         generated_files = []
         script_name = script_path.stem
 
-        for i, chunk in enumerate(tqdm(chunks, desc="Generating audio chunks")):
-            chunk_output = self.temp_dir / f"{script_name}_chunk_{i+1:03d}.wav"
-
-            if self.generate_audio_chunk(chunk, reference_audio, reference_text, chunk_output):
-                generated_files.append(chunk_output)
-
-                # Upload chunk to Drive immediately if enabled
-                if upload_to_drive and self.drive_manager:
-                    self.drive_manager.upload_file(chunk_output, drive_folder_id)
-
-            # Small delay to avoid overwhelming the GPU
-            time.sleep(0.5)
-
-        # Merge all chunks
-        if generated_files:
+        # With accelerate, each process only generates its own share of the chunks
+        chunk_ids = list(range(len(chunks)))
+        is_main = self.accelerator is None or self.accelerator.is_main_process
+        shard = (self.accelerator.split_between_processes(chunk_ids)
+                 if self.accelerator else contextlib.nullcontext(chunk_ids))
+
+        with shard as my_chunk_ids:
+            for start in tqdm(range(0, len(my_chunk_ids), self.batch_size),
+                              desc="Generating audio batches", disable=not is_main):
+                batch_ids = my_chunk_ids[start:start + self.batch_size]
+                batch = [chunks[i] for i in batch_ids]
+                batch_outputs = [
+                    self.temp_dir / f"{script_name}_chunk_{i + 1:03d}.wav"
+                    for i in batch_ids
+                ]
+
+                results = self.generate_audio_batch(batch, reference_audio, reference_text, batch_outputs)
+                for chunk_output, ok in zip(batch_outputs, results):
+                    if ok:
+                        generated_files.append(chunk_output)
+
+                        # Upload chunk to Drive in the background if enabled
+                        if upload_to_drive and self.drive_manager:
+                            self._upload_q.put((chunk_output, drive_folder_id))
+                    else:
+                        print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} {chunk_output.name} failed and "
+                              f"will be missing from {script_name}_complete.wav")
+
+                if self.chunk_sleep > 0:
+                    time.sleep(self.chunk_sleep)
+
+        if self.accelerator:
+            # Collect every rank's chunks; zero-padded names sort in script order
+            self.accelerator.wait_for_everyone()
+            generated_files = sorted(gather_object(generated_files))
+
+        # Merge all chunks (main process only)
+        if generated_files and is_main:
             final_output = self.output_dir / f"{script_name}_complete.wav"
             if self.merge_audio_files(generated_files, final_output):
                 generated_files.append(final_output)
 
                 # Upload final merged file to Drive
                 if upload_to_drive and self.drive_manager:
-                    self.drive_manager.upload_file(final_output, drive_folder_id)
+                    self._upload_q.put((final_output, drive_folder_id))
 
         print(f"\n{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Processing complete!")
         print(f"  Generated {len(generated_files)} files")
@@ -233,7 +683,11 @@ def main():
     """Main execution function"""
     import argparse
 
-    parser = argparse.ArgumentParser(description='Audio Processor with Whisper + F5-TTS')
+    parser = argparse.ArgumentParser(
+        description='Audio Processor with Whisper + F5-TTS',
+        epilog='Set F5TTS_CHUNK_SLEEP=<seconds> to pause between generation batches '
+               '(default 0, no pause).'
+    )
     parser.add_argument('--reference-audio', '-r', type=str, required=True,
                        help='Path to reference audio file')
     parser.add_argument('--script', '-s', type=str, required=True,
@@ -242,20 +696,35 @@ def main():
                        help='Google Drive folder ID for uploads')
     parser.add_argument('--no-upload', action='store_true',
                        help='Disable automatic upload to Drive')
-    parser.add_argument('--whisper-model', '-w', type=str, default='base',
+    parser.add_argument('--whisper-model', '-w', type=str, default='tiny',
                        choices=['tiny', 'base', 'small', 'medium', 'large'],
-                       help='Whisper model size')
+                       help='Whisper model size (tiny is enough for the reference transcript)')
     parser.add_argument('--base-dir', '-b', type=str, default='/workspace/f5tts_project',
                        help='Base directory')
+    parser.add_argument('--batch-size', type=int, default=4,
+                       help='Number of chunks generated per F5-TTS forward pass')
+    parser.add_argument('--nfe-steps', type=int, default=32,
+                       help='F5-TTS ODE solver steps (16 for fast mode)')
+    parser.add_argument('--ode-method', type=str, default='euler',
+                       choices=['euler', 'midpoint'],
+                       help='F5-TTS ODE solver method')
+    parser.add_argument('--no-compile', action='store_true',
+                       help='Run F5-TTS in eager mode instead of torch.compile')
+    parser.add_argument('--bf16', action='store_true',
+                       help='Cast the F5-TTS DiT to BF16 (default: F5-TTS precision, FP16 on CUDA)')
 
     args = parser.parse_args()
 
     try:
         # Initialize processor
-        processor = AudioProcessor(Path(args.base_dir))
-
-        # Load Whisper model
-        processor.load_whisper_model(args.whisper_model)
+        processor = AudioProcessor(
+            Path(args.base_dir),
+            batch_size=args.batch_size,
+            nfe_step=args.nfe_steps,
+            ode_method=args.ode_method,
+            compile_models=not args.no_compile,
+            use_bf16=args.bf16
+        )
 
         # Transcribe reference audio
         reference_audio = Path(args.reference_audio)
@@ -263,7 +732,14 @@ def main():
             print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Reference audio not found: {reference_audio}")
             sys.exit(1)
 
-        reference_text = processor.transcribe_audio(reference_audio)
+        # Under accelerate launch only the main process loads Whisper; the other
+        # ranks receive its transcript
+        reference_text = None
+        if processor.accelerator is None or processor.accelerator.is_main_process:
+            processor.load_whisper_model(args.whisper_model)
+            reference_text = processor.transcribe_audio(reference_audio)
+        if processor.accelerator:
+            reference_text = broadcast_object_list([reference_text])[0]
 
         # Initialize Drive manager if upload is enabled
         if not args.no_upload:
@@ -283,6 +759,10 @@ def main():
             drive_folder_id=args.output_folder_id
         )
 
+        failed_uploads = processor.flush_uploads()
+        if failed_uploads:
+            print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} {failed_uploads} file(s) failed to upload to Drive")
+
         print(f"\n{Colors.OKGREEN}{Colors.BOLD}All done!{Colors.ENDC}")
         print(f"Generated files: {len(generated_files)}")
 
@@ -1,35 +1,45 @@
 #!/usr/bin/env python3
 """
-Simple script to extract Google Drive access token from token.pickle
+Simple script to extract Google Drive access token from token.json
 Run once, copy token to settings, done!
 """
 
-import pickle
+import json
 import os
+import sys
+
+try:
+    from google.oauth2.credentials import Credentials
+except ImportError:
+    print("❌ google-auth not installed.")
+    print("   Install with: pip install google-auth")
+    sys.exit(1)
 
 try:
     from google.auth.transport.requests import Request
     CAN_REFRESH = True
 except ImportError:
-    print("⚠️  google-auth not installed. Token refresh not available.")
-    print("   Install with: pip install google-auth")
+    print("⚠️  requests not installed. Token refresh not available.")
+    print("   Install with: pip install requests")
     CAN_REFRESH = False
 
-TOKEN_PICKLE = 'token.pickle'
+TOKEN_JSON = 'token.json'
+SCOPES = ['https://www.googleapis.com/auth/drive']
 
 def extract_token():
-    """Extract access token from token.pickle"""
+    """Extract access token from token.json"""
 
-    if not os.path.exists(TOKEN_PICKLE):
-        print(f"❌ Error: {TOKEN_PICKLE} not found!")
-        print(f"   Please make sure {TOKEN_PICKLE} exists in the project folder.")
+    if not os.path.exists(TOKEN_JSON):
+        print(f"❌ Error: {TOKEN_JSON} not found!")
+        print(f"   Please make sure {TOKEN_JSON} exists in the project folder.")
+        print("   Create it with: python gdrive_auth.py")
         return None
 
     try:
-        print(f"📦 Reading {TOKEN_PICKLE}...")
+        print(f"📦 Reading {TOKEN_JSON}...")
 
-        with open(TOKEN_PICKLE, 'rb') as token_file:
-            credentials = pickle.load(token_file)
+        with open(TOKEN_JSON) as token_file:
+            credentials = Credentials.from_authorized_user_info(json.load(token_file), SCOPES)
 
         print("✓ Token loaded successfully")
 
@@ -42,9 +52,9 @@ def extract_token():
                     print("✓ Token refreshed")
 
                     # Save refreshed token back
-                    with open(TOKEN_PICKLE, 'wb') as token_file:
-                        pickle.dump(credentials, token_file)
-                    print(f"✓ Refreshed token saved to {TOKEN_PICKLE}")
+                    with open(TOKEN_JSON, 'w') as token_file:
+                        token_file.write(credentials.to_json())
+                    print(f"✓ Refreshed token saved to {TOKEN_JSON}")
                 else:
                     print("⚠️  Token invalid and cannot be refreshed")
 
@@ -76,7 +86,7 @@ def extract_token():
 
     except Exception as e:
         print(f"❌ Error: {e}")
-        print(f"   Make sure {TOKEN_PICKLE} is a valid Google OAuth token file")
+        print(f"   Make sure {TOKEN_JSON} is a valid Google OAuth token file")
         return None
 
 if __name__ == '__main__':
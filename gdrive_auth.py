@@ -1,6 +1,5 @@
 # gdrive_auth.py ko replace karo:
 from google_auth_oauthlib.flow import InstalledAppFlow
-import pickle
 
 SCOPES = ['https://www.googleapis.com/auth/drive']
 
@@ -19,7 +18,7 @@ code = input().strip()
 flow.fetch_token(code=code)
 creds = flow.credentials
 
-with open('token.pickle', 'wb') as token:
-    pickle.dump(creds, token)
+with open('token.json', 'w') as token:
+    token.write(creds.to_json())
 
-print("✅ Authentication successful! token.pickle created.")
\ No newline at end of file
+print("✅ Authentication successful! token.json created.")
\ No newline at end of file
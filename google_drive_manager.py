@@ -5,11 +5,17 @@ Handles downloading scripts/reference audio and uploading generated audio
 """
 
 import os
-import pickle
+import sys
+import threading
+import concurrent.futures
 from pathlib import Path
-from pydrive2.auth import GoogleAuth
-from pydrive2.drive import GoogleDrive
-from typing import List, Optional
+import httplib2
+import google_auth_httplib2
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
+from typing import Dict, List, Optional
 import json
 
 class Colors:
@@ -19,16 +25,37 @@ class Colors:
     ENDC = '\033[0m'
     OKBLUE = '\033[94m'
 
+# Plain output when redirected to a log file or when NO_COLOR is set
+if os.environ.get('NO_COLOR') or not sys.stdout.isatty():
+    for _name in [k for k in vars(Colors) if k.isupper()]:
+        setattr(Colors, _name, '')
+
+SCOPES = ['https://www.googleapis.com/auth/drive']
+
+# Resumable upload chunk size; larger chunks mean fewer round-trips per file
+UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+# Sibling folders listed per Drive query when walking a folder tree
+FOLDER_QUERY_BATCH = 50
+# Drive accepts at most 100 calls in one batch HTTP request
+MAX_BATCH_SIZE = 100
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
 class DriveManager:
     def __init__(self, base_dir: Path = Path('/workspace/f5tts_project')):
         self.base_dir = base_dir
         self.creds_file = base_dir / 'credentials.json'
-        self.token_file = base_dir / 'token.pickle'
-        self.drive = None
+        self.token_file = base_dir / 'token.json'
+        self.credentials = None
+        self.service = None
+        self._cache_lock = threading.Lock()
+        # folder_id -> {file name: file id}, filled once per folder by upload_file
+        self._folder_cache: Dict[str, Dict[str, str]] = {}
+        # One persistent HTTP connection per thread, reused across requests
+        self._local = threading.local()
         self.authenticate()
 
     def authenticate(self):
-        """Authenticate with Google Drive using existing token.pickle"""
+        """Authenticate with Google Drive using existing token.json"""
         print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Authenticating with Google Drive...")
 
         if not self.creds_file.exists():
@@ -36,76 +63,179 @@ class DriveManager:
             raise FileNotFoundError("credentials.json is required")
 
         if not self.token_file.exists():
-            print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} token.pickle not found at {self.token_file}")
-            raise FileNotFoundError("token.pickle is required")
+            print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} token.json not found at {self.token_file}")
+            print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} Run gdrive_auth.py to create it")
+            raise FileNotFoundError("token.json is required")
 
         try:
-            gauth = GoogleAuth()
-
-            # Load credentials from pickle file
-            with open(self.token_file, 'rb') as token:
-                gauth.credentials = pickle.load(token)
+            # Load credentials from JSON token file
+            with open(self.token_file) as token:
+                creds = Credentials.from_authorized_user_info(json.load(token), SCOPES)
 
             # Refresh if expired
-            if gauth.access_token_expired:
-                gauth.Refresh()
-                # Save refreshed token
-                with open(self.token_file, 'wb') as token:
-                    pickle.dump(gauth.credentials, token)
-            else:
-                gauth.Authorize()
-
-            self.drive = GoogleDrive(gauth)
+            if not creds.valid and creds.refresh_token:
+                creds.refresh(Request())
+                # Save refreshed token atomically; other processes may be reading it
+                tmp_file = self.token_file.with_suffix(f'.{os.getpid()}.tmp')
+                with open(tmp_file, 'w') as token:
+                    token.write(creds.to_json())
+                os.replace(tmp_file, self.token_file)
+
+            self.credentials = creds
+            # Single Drive v3 service for every call, kept for the manager's lifetime
+            self.service = build('drive', 'v3', credentials=creds, cache_discovery=False)
             print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Authenticated with Google Drive")
 
         except Exception as e:
             print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Authentication failed: {str(e)}")
             raise
 
+    def _thread_http(self):
+        """Authorized HTTP object for the calling thread (httplib2 is not thread-safe)"""
+        if not hasattr(self._local, 'http'):
+            self._local.http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+        return self._local.http
+
     def list_files_in_folder(self, folder_id: str) -> List[dict]:
         """List all files in a Google Drive folder"""
+        return self._list_query(f"'{folder_id}' in parents and trashed=false")
+
+    def _list_request(self, query: str, page_token: Optional[str] = None):
+        """Build a files().list request for one page of a query"""
+        return self.service.files().list(
+            q=query,
+            fields='nextPageToken, files(id, name, mimeType, parents)',
+            pageSize=1000,
+            pageToken=page_token
+        )
+
+    def _list_query(self, query: str, page_token: Optional[str] = None) -> List[dict]:
+        """Run a Drive file query, following every result page"""
         try:
-            query = f"'{folder_id}' in parents and trashed=false"
-            file_list = self.drive.ListFile({'q': query}).GetList()
-            return file_list
+            file_list = []
+            while True:
+                response = self._list_request(query, page_token).execute(http=self._thread_http())
+                file_list.extend(response.get('files', []))
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    return file_list
         except Exception as e:
             print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Failed to list files: {str(e)}")
             return []
 
+    def _batch_list(self, queries: List[str], batch_size: int = MAX_BATCH_SIZE) -> List[dict]:
+        """Run several file queries, sending up to batch_size of them per HTTP round-trip"""
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        file_list = []
+        more_pages = []
+
+        def collect(request_id, response, exception):
+            if exception is not None:
+                print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Failed to list files: {str(exception)}")
+                return
+            file_list.extend(response.get('files', []))
+            if response.get('nextPageToken'):
+                more_pages.append((queries[int(request_id)], response['nextPageToken']))
+
+        for start in range(0, len(queries), batch_size):
+            batch = self.service.new_batch_http_request(callback=collect)
+            for i in range(start, min(start + batch_size, len(queries))):
+                batch.add(self._list_request(queries[i]), request_id=str(i))
+            try:
+                batch.execute(http=self._thread_http())
+            except Exception as e:
+                print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Failed to list files: {str(e)}")
+
+        # First pages came back in the batch; large folders continue page by page
+        for query, page_token in more_pages:
+            file_list.extend(self._list_query(query, page_token))
+
+        return file_list
+
     def download_file(self, file_id: str, destination: Path) -> bool:
         """Download a file from Google Drive"""
         try:
-            file = self.drive.CreateFile({'id': file_id})
-            file.GetContentFile(str(destination))
+            # Each thread downloads over its own HTTP connection
+            request = self.service.files().get_media(fileId=file_id)
+            request.http = self._thread_http()
+            with open(destination, 'wb') as fh:
+                downloader = MediaIoBaseDownload(fh, request)
+                done = False
+                while not done:
+                    _, done = downloader.next_chunk()
             print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Downloaded: {destination.name}")
             return True
         except Exception as e:
             print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Failed to download {file_id}: {str(e)}")
+            # Don't leave a truncated file behind as if it were complete
+            try:
+                destination.unlink(missing_ok=True)
+            except OSError:
+                pass
             return False
 
-    def download_folder(self, folder_id: str, destination_dir: Path, recursive: bool = True) -> int:
+    def download_folder(self, folder_id: str, destination_dir: Path, recursive: bool = True,
+                        parallel_downloads: int = 8, batch_size: int = MAX_BATCH_SIZE) -> int:
         """Download all files from a Google Drive folder"""
-        destination_dir.mkdir(parents=True, exist_ok=True)
-        files = self.list_files_in_folder(folder_id)
-        downloaded_count = 0
-
-        for file in files:
-            file_name = file['title']
-            file_id = file['id']
-            mime_type = file['mimeType']
-
-            if mime_type == 'application/vnd.google-apps.folder':
-                if recursive:
-                    subfolder_path = destination_dir / file_name
-                    print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Downloading folder: {file_name}")
-                    downloaded_count += self.download_folder(file_id, subfolder_path, recursive)
-            else:
-                destination_file = destination_dir / file_name
-                if self.download_file(file_id, destination_file):
-                    downloaded_count += 1
+        # Walk the tree one level at a time; each level's listing queries go out in
+        # Drive batch requests, with many sibling folders per query
+        folder_paths = {folder_id: destination_dir}
+        pending = [folder_id]
+        # Local path -> file id; Drive allows duplicate names in a folder, and only one
+        # download may write each path (the last listed wins, as before)
+        downloads: Dict[Path, str] = {}
+
+        while pending:
+            level, pending = pending, []
+            level_ids = set(level)
+            queries = []
+            for start in range(0, len(level), FOLDER_QUERY_BATCH):
+                group = level[start:start + FOLDER_QUERY_BATCH]
+                parents = ' or '.join(f"'{parent_id}' in parents" for parent_id in group)
+                queries.append(f"trashed=false and ({parents})")
+
+            for file in self._batch_list(queries, batch_size):
+                parent_id = next(
+                    (p for p in file.get('parents', []) if p in level_ids), level[0]
+                )
+                local_path = folder_paths[parent_id] / file['name']
+
+                if file['mimeType'] == FOLDER_MIME_TYPE:
+                    if recursive:
+                        print(f"{Colors.OKBLUE}[INFO]{Colors.ENDC} Downloading folder: {file['name']}")
+                        folder_paths[file['id']] = local_path
+                        pending.append(file['id'])
+                else:
+                    if local_path in downloads:
+                        print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} Duplicate name in Drive, keeping one copy: {file['name']}")
+                    downloads[local_path] = file['id']
+
+        for local_dir in folder_paths.values():
+            local_dir.mkdir(parents=True, exist_ok=True)
+
+        # Media downloads cannot be batched, so fetch file contents in parallel
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, parallel_downloads)) as pool:
+            results = pool.map(lambda d: self.download_file(d[1], d[0]), downloads.items())
+            downloaded_count = sum(1 for ok in results if ok)
 
         return downloaded_count
 
+    def clear_folder_cache(self):
+        """Forget cached folder listings, e.g. between jobs of a long-running process"""
+        with self._cache_lock:
+            self._folder_cache.clear()
+
+    def _cached_file_id(self, folder_id: str, file_name: str) -> Optional[str]:
+        """Look up a file by name, listing the folder only on first use"""
+        if folder_id not in self._folder_cache:
+            files = self.list_files_in_folder(folder_id)
+            with self._cache_lock:
+                self._folder_cache.setdefault(
+                    folder_id, {f['name']: f['id'] for f in files}
+                )
+        with self._cache_lock:
+            return self._folder_cache[folder_id].get(file_name)
+
     def upload_file(self, file_path: Path, folder_id: Optional[str] = None,
                    overwrite: bool = False) -> Optional[str]:
         """Upload a file to Google Drive"""
@@ -116,23 +246,28 @@ class DriveManager:
 
             # Check if file already exists
             if folder_id and not overwrite:
-                existing_files = self.list_files_in_folder(folder_id)
-                for existing_file in existing_files:
-                    if existing_file['title'] == file_path.name:
-                        print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} File already exists: {file_path.name}")
-                        return existing_file['id']
+                existing_id = self._cached_file_id(folder_id, file_path.name)
+                if existing_id:
+                    print(f"{Colors.WARNING}[WARNING]{Colors.ENDC} File already exists: {file_path.name}")
+                    return existing_id
 
             # Create file metadata
             file_metadata = {
-                'title': file_path.name,
+                'name': file_path.name,
             }
             if folder_id:
-                file_metadata['parents'] = [{'id': folder_id}]
+                file_metadata['parents'] = [folder_id]
 
-            # Upload file
-            file = self.drive.CreateFile(file_metadata)
-            file.SetContentFile(str(file_path))
-            file.Upload()
+            # Upload file in large resumable chunks
+            media = MediaFileUpload(str(file_path), chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+            file = self.service.files().create(
+                body=file_metadata, media_body=media, fields='id'
+            ).execute(http=self._thread_http())
+
+            if folder_id:
+                with self._cache_lock:
+                    if folder_id in self._folder_cache:
+                        self._folder_cache[folder_id][file_path.name] = file['id']
 
             print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Uploaded: {file_path.name} (ID: {file['id']})")
             return file['id']
@@ -147,14 +282,12 @@ class DriveManager:
             print(f"{Colors.FAIL}[ERROR]{Colors.ENDC} Directory not found: {folder_path}")
             return 0
 
-        uploaded_count = 0
-        for file_path in folder_path.iterdir():
-            if file_path.is_file():
-                if self.upload_file(file_path, parent_folder_id):
-                    uploaded_count += 1
-            elif file_path.is_dir():
-                # Recursively upload subdirectories
-                uploaded_count += self.upload_folder(file_path, parent_folder_id)
+        # Subdirectories are flattened into the same Drive folder
+        file_paths = [p for p in folder_path.rglob('*') if p.is_file()]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            results = pool.map(lambda p: self.upload_file(p, parent_folder_id), file_paths)
+            uploaded_count = sum(1 for file_id in results if file_id)
 
         return uploaded_count
 
@@ -162,14 +295,15 @@ class DriveManager:
         """Create a new folder in Google Drive"""
         try:
             file_metadata = {
-                'title': folder_name,
-                'mimeType': 'application/vnd.google-apps.folder'
+                'name': folder_name,
+                'mimeType': FOLDER_MIME_TYPE
             }
             if parent_folder_id:
-                file_metadata['parents'] = [{'id': parent_folder_id}]
+                file_metadata['parents'] = [parent_folder_id]
 
-            folder = self.drive.CreateFile(file_metadata)
-            folder.Upload()
+            folder = self.service.files().create(
+                body=file_metadata, fields='id'
+            ).execute(http=self._thread_http())
 
             print(f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC} Created folder: {folder_name} (ID: {folder['id']})")
             return folder['id']
@@ -207,7 +341,7 @@ def main():
             files = manager.list_files_in_folder(args.folder_id)
             print(f"\n{Colors.OKBLUE}Files in folder:{Colors.ENDC}")
             for file in files:
-                print(f"  - {file['title']} (ID: {file['id']})")
+                print(f"  - {file['name']} (ID: {file['id']})")
 
         elif args.action == 'download':
             if not args.folder_id or not args.local_path:
@@ -5,16 +5,48 @@ One-command execution: Download → Transcribe → Generate → Upload
 
 Usage:
     python run_complete_pipeline.py --config config.json
+
+    # Fast mode: fewer ODE steps
+    python run_complete_pipeline.py --config config.json --nfe-steps 16
+
+    # Keep models loaded between runs
+    python run_complete_pipeline.py --server
+    python run_complete_pipeline.py --client --config config.json
 """
 
 import os
 import sys
 import json
+import asyncio
+import logging
+import hashlib
+import socket
 import argparse
+import contextlib
 from pathlib import Path
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Tuple
 from google_drive_manager import DriveManager
 from audio_processor import AudioProcessor
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Reference audio formats picked up when the configured file is missing, most preferred first
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac', '.m4a')
+SOCKET_PATH = '/tmp/f5tts.sock'
+
+# Drive manager and audio processor (with its loaded models) shared by every
+# job run in this process; see --server
+_STATE = {}
+
+# Parsed configs keyed by (path, mtime_ns) so unchanged files aren't re-read
+_CFG_CACHE: Dict[Tuple[str, int], dict] = {}
+
 
 class Colors:
     HEADER = '\033[95m'
@@ -26,21 +58,69 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Plain output when redirected to a log file or when NO_COLOR is set
+if os.environ.get('NO_COLOR') or not sys.stdout.isatty():
+    for _name in [k for k in vars(Colors) if k.isupper()]:
+        setattr(Colors, _name, '')
+
+
+SUCCESS = 25
+logging.addLevelName(SUCCESS, 'SUCCESS')
+
+_LEVELS = {
+    'info': logging.INFO,
+    'success': SUCCESS,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+}
+
+
+class _StatusFormatter(logging.Formatter):
+    """Prefix records with the colored [LEVEL] tag; headers are passed through as-is"""
+    COLORS = {
+        logging.INFO: 'OKBLUE',
+        SUCCESS: 'OKGREEN',
+        logging.WARNING: 'WARNING',
+        logging.ERROR: 'FAIL',
+    }
+
+    def format(self, record):
+        message = record.getMessage()
+        if getattr(record, 'header', False) or record.levelno not in self.COLORS:
+            return message
+        color = getattr(Colors, self.COLORS[record.levelno])
+        return f"{color}[{record.levelname}]{Colors.ENDC} {message}"
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Write to whatever sys.stdout currently is, so --server can redirect job output"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+logger = logging.getLogger('f5tts')
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_handler = _StdoutHandler()
+_handler.setFormatter(_StatusFormatter())
+logger.addHandler(_handler)
+
 
 def print_header(message):
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{message.center(70)}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    # One record (one write) for the whole banner
+    rule = f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}"
+    title = f"{Colors.HEADER}{Colors.BOLD}{message.center(70)}{Colors.ENDC}"
+    logger.info(f"\n{rule}\n{title}\n{rule}\n", extra={'header': True})
 
 
 def print_status(message, status='info'):
-    prefix = {
-        'info': f"{Colors.OKBLUE}[INFO]{Colors.ENDC}",
-        'success': f"{Colors.OKGREEN}[SUCCESS]{Colors.ENDC}",
-        'warning': f"{Colors.WARNING}[WARNING]{Colors.ENDC}",
-        'error': f"{Colors.FAIL}[ERROR]{Colors.ENDC}",
-    }
-    print(f"{prefix.get(status, '')} {message}")
+    logger.log(_LEVELS.get(status, logging.INFO), message)
 
 
 def load_config(config_path: Path) -> dict:
@@ -54,8 +134,13 @@ def load_config(config_path: Path) -> dict:
             "scripts_folder_id": "YOUR_SCRIPTS_FOLDER_ID",
             "reference_audio_folder_id": "YOUR_REFERENCE_AUDIO_FOLDER_ID",
             "output_folder_id": "YOUR_OUTPUT_FOLDER_ID",
-            "whisper_model": "base",
+            "_comment_whisper": "'tiny' is enough for F5-TTS reference conditioning; "
+                                "use 'base' or larger only for dysfluent or low-volume references",
+            "whisper_model": "tiny",
             "chunk_size": 500,
+            "max_concurrent": 1,
+            "parallel_downloads": 8,
+            "drive_batch_size": 100,
             "auto_download": True,
             "auto_upload": True,
             "reference_audio_file": "reference.wav",
@@ -68,41 +153,168 @@ def load_config(config_path: Path) -> dict:
         print_status("Example config.json created. Please edit it with your folder IDs.", 'success')
         sys.exit(0)
 
-    with open(config_path) as f:
-        return json.load(f)
+    key = (str(config_path), config_path.stat().st_mtime_ns)
+    if key not in _CFG_CACHE:
+        # Drop entries for older versions of this file
+        for stale in [k for k in _CFG_CACHE if k[0] == key[0]]:
+            del _CFG_CACHE[stale]
+        _CFG_CACHE[key] = _json_loads(config_path.read_bytes())
+    return _CFG_CACHE[key]
+
+
+# PipelineConfig field type -> (description, validator)
+_FIELD_CHECKS = {
+    bool: ("true or false", lambda v: isinstance(v, bool)),
+    int: ("an integer", lambda v: isinstance(v, int) and not isinstance(v, bool)),
+    str: ("a string", lambda v: isinstance(v, str)),
+    Optional[str]: ("a string", lambda v: v is None or isinstance(v, str)),
+    List[str]: ("a list of strings", lambda v: isinstance(v, list) and all(isinstance(x, str) for x in v)),
+}
+
+
+@dataclass(slots=True)
+class PipelineConfig:
+    """Settings for one pipeline job, built from config.json (or a --client request)"""
+    input_folder_id: Optional[str] = None
+    scripts_folder_id: Optional[str] = None
+    reference_audio_folder_id: Optional[str] = None
+    output_folder_id: Optional[str] = None
+    whisper_model: str = 'tiny'
+    chunk_size: int = 500
+    max_concurrent: int = 1
+    parallel_downloads: int = 8
+    drive_batch_size: int = 100
+    auto_download: bool = True
+    auto_upload: bool = True
+    reference_audio_file: str = 'reference.wav'
+    scripts: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        # JSON gives no type guarantees: "false" would be truthy, "a.txt" iterated per char
+        for f in fields(self):
+            description, is_valid = _FIELD_CHECKS[f.type]
+            value = getattr(self, f.name)
+            if not is_valid(value):
+                raise ValueError(f"Config key '{f.name}' must be {description}, got {value!r}")
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PipelineConfig':
+        """Build from parsed JSON, ignoring _comment keys and warning about unknown ones"""
+        names = {f.name for f in fields(cls)}
+        for key in data:
+            if key not in names and not key.startswith('_'):
+                print_status(f"Ignoring unknown config key: {key}", 'warning')
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+def list_files(directory: Path) -> Dict[str, Path]:
+    """Name -> path of the regular files in a directory (empty if it doesn't exist)"""
+    try:
+        with os.scandir(directory) as it:
+            return {e.name: Path(e.path) for e in it if e.is_file()}
+    except FileNotFoundError:
+        return {}
+
 
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def transcribe_reference(processor: AudioProcessor, audio_path: Path,
+                         whisper_model: str, base_dir: Path) -> str:
+    """Transcribe reference audio, reusing the cached text for identical audio"""
+    cache_file = base_dir / '.cache' / 'ref_transcripts.json'
+    cache_key = f"{file_sha256(audio_path)}:{whisper_model}"
+
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+        if not isinstance(cache, dict):
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+
+    if cache_key in cache:
+        print_status(f"Using cached transcription for {audio_path.name}", 'success')
+        return cache[cache_key]
+
+    # Cache miss: only now pay for loading Whisper
+    # Keep the converted model on the persistent volume so new instances skip the download
+    processor.load_whisper_model(whisper_model, cache_dir=base_dir / '.cache' / 'whisper')
+    reference_text = processor.transcribe_audio(audio_path)
+
+    cache[cache_key] = reference_text
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print_status(f"Could not save transcription cache: {str(e)}", 'warning')
 
-def run_pipeline(config: dict, base_dir: Path):
+    return reference_text
+
+
+def _prepare_state(base_dir: Path, preload: bool = False,
+                   processor_options: Optional[dict] = None) -> dict:
+    """Create the Drive manager and audio processor once per process"""
+    if _STATE.get('base_dir') != base_dir:
+        print_status("Initializing Drive Manager...", 'info')
+        _STATE['drive_manager'] = DriveManager(base_dir)
+
+        print_status("Initializing Audio Processor...", 'info')
+        _STATE['processor'] = AudioProcessor(base_dir, **(processor_options or {}))
+        _STATE['base_dir'] = base_dir
+
+        if preload:
+            _STATE['processor'].load_f5tts_model()
+
+    return _STATE
+
+
+def run_pipeline(config: dict, base_dir: Path, processor_options: Optional[dict] = None):
     """Run the complete pipeline"""
 
     print_header("F5-TTS Complete Pipeline")
 
-    # Initialize managers
-    print_status("Initializing Drive Manager...", 'info')
-    drive_manager = DriveManager(base_dir)
+    state = _prepare_state(base_dir, processor_options=processor_options)
+    _handle_job(PipelineConfig.from_dict(config), base_dir,
+                state['drive_manager'], state['processor'])
 
-    print_status("Initializing Audio Processor...", 'info')
-    processor = AudioProcessor(base_dir)
+
+def _fetch_inputs(config: PipelineConfig, base_dir: Path, drive_manager: DriveManager,
+                  processor: AudioProcessor) -> Optional[Tuple[Path, str]]:
+    """Download inputs and transcribe the reference; None if there is no reference audio"""
 
     # Step 1: Download inputs from Drive
-    if config.get('auto_download', True):
+    if config.auto_download:
         print_header("Step 1: Downloading from Google Drive")
 
         # Download scripts
-        if 'scripts_folder_id' in config:
+        if config.scripts_folder_id:
             print_status("Downloading scripts...", 'info')
             scripts_count = drive_manager.download_folder(
-                config['scripts_folder_id'],
-                processor.scripts_dir
+                config.scripts_folder_id,
+                processor.scripts_dir,
+                parallel_downloads=config.parallel_downloads,
+                batch_size=config.drive_batch_size
             )
             print_status(f"Downloaded {scripts_count} script files", 'success')
 
         # Download reference audio
-        if 'reference_audio_folder_id' in config:
+        if config.reference_audio_folder_id:
             print_status("Downloading reference audio...", 'info')
             audio_count = drive_manager.download_folder(
-                config['reference_audio_folder_id'],
-                processor.reference_audio_dir
+                config.reference_audio_folder_id,
+                processor.reference_audio_dir,
+                parallel_downloads=config.parallel_downloads,
+                batch_size=config.drive_batch_size
             )
             print_status(f"Downloaded {audio_count} audio files", 'success')
     else:
@@ -111,40 +323,76 @@ def run_pipeline(config: dict, base_dir: Path):
     # Step 2: Find reference audio
     print_header("Step 2: Transcribing Reference Audio")
 
-    reference_audio_file = config.get('reference_audio_file', 'reference.wav')
-    reference_audio_path = processor.reference_audio_dir / reference_audio_file
+    reference_audio_path = processor.reference_audio_dir / config.reference_audio_file
 
     if not reference_audio_path.exists():
-        # Try to find any audio file
-        audio_files = list(processor.reference_audio_dir.glob('*.wav'))
-        audio_files.extend(list(processor.reference_audio_dir.glob('*.mp3')))
+        # Try to find any audio file (one directory read for all extensions)
+        audio_files = [path for name, path in list_files(processor.reference_audio_dir).items()
+                       if name.lower().endswith(AUDIO_EXTENSIONS)]
+        # Deterministic pick: preferred format first (AUDIO_EXTENSIONS order), then by name
+        audio_files.sort(key=lambda p: (AUDIO_EXTENSIONS.index(p.suffix.lower()), p.name))
 
         if not audio_files:
             print_status("No reference audio found!", 'error')
-            sys.exit(1)
+            return None
 
         reference_audio_path = audio_files[0]
         print_status(f"Using reference audio: {reference_audio_path.name}", 'info')
 
-    # Load Whisper and transcribe
-    processor.load_whisper_model(config.get('whisper_model', 'base'))
-    reference_text = processor.transcribe_audio(reference_audio_path)
+    # Load Whisper and transcribe (skipped when this audio was transcribed before)
+    reference_text = transcribe_reference(
+        processor,
+        reference_audio_path,
+        config.whisper_model,
+        base_dir
+    )
+    return reference_audio_path, reference_text
+
+
+def _handle_job(config: PipelineConfig, base_dir: Path, drive_manager: DriveManager,
+                processor: AudioProcessor):
+    """Download, transcribe, generate and upload for one config"""
+    # Drive contents may have changed since the previous job in this process
+    drive_manager.clear_folder_cache()
+
+    # Under accelerate launch only the main process downloads and transcribes, so
+    # ranks never read inputs another rank is still writing
+    accelerator = processor.accelerator
+    reference = None
+    if accelerator is None or accelerator.is_main_process:
+        reference = _fetch_inputs(config, base_dir, drive_manager, processor)
+    if accelerator:
+        from accelerate.utils import broadcast_object_list
+        accelerator.wait_for_everyone()
+        reference = broadcast_object_list([reference])[0]
+
+    if reference is None:
+        sys.exit(1)
+    reference_audio_path, reference_text = reference
 
     # Step 3: Process scripts
     print_header("Step 3: Generating Audio")
 
     # Find script files
     script_files = []
-    if 'scripts' in config and config['scripts']:
-        for script_name in config['scripts']:
-            script_path = processor.scripts_dir / script_name
-            if script_path.exists():
+    if config.scripts:
+        # One directory read instead of a stat per configured script; names in
+        # subfolders (recreated by download_folder) still need their own check
+        present = list_files(processor.scripts_dir)
+        for script_name in config.scripts:
+            script_path = present.get(script_name)
+            if script_path is None and ('/' in script_name or os.sep in script_name):
+                candidate = processor.scripts_dir / script_name
+                if candidate.is_file():
+                    script_path = candidate
+            if script_path:
                 script_files.append(script_path)
             else:
                 print_status(f"Script not found: {script_name}", 'warning')
     else:
         # Process all .txt files in scripts directory
-        script_files = list(processor.scripts_dir.glob('*.txt'))
+        script_files = [path for name, path in list_files(processor.scripts_dir).items()
+                        if name.endswith('.txt')]
 
     if not script_files:
         print_status("No script files found!", 'error')
@@ -152,23 +400,72 @@ def run_pipeline(config: dict, base_dir: Path):
 
     print_status(f"Found {len(script_files)} scripts to process", 'info')
 
+    # Reuse the reference mel from earlier runs on this volume
+    processor.ref_embed_cache_dir = base_dir / '.cache' / 'ref_embeds'
+
     # Set Drive manager for auto-upload
-    if config.get('auto_upload', True):
+    if config.auto_upload:
         processor.drive_manager = drive_manager
 
-    # Process each script
-    all_generated_files = []
-    for i, script_file in enumerate(script_files, 1):
-        print_header(f"Processing Script {i}/{len(script_files)}: {script_file.name}")
+    # Process scripts, optionally several at a time (uploads already run in the background)
+    max_concurrent = int(config.max_concurrent)
+    if processor.accelerator:
+        # Every rank must walk the scripts in lockstep for the collective ops
+        max_concurrent = 1
 
-        try:
-            generated_files = processor.process_script(
+    # Load the model and reference once, before any worker thread needs them
+    processor.load_f5tts_model()
+    processor.prepare_reference(reference_audio_path, reference_text)
+
+    all_generated_files = asyncio.run(_process_all(
+        processor, script_files, reference_audio_path, reference_text, config, max_concurrent
+    ))
+
+    # Uploads run in the background; wait for the last ones before summarising
+    failed_uploads = processor.flush_uploads()
+
+    # Final summary
+    print_header("Pipeline Complete!")
+    print_status(f"Total scripts processed: {len(script_files)}", 'success')
+    print_status(f"Total audio files generated: {len(all_generated_files)}", 'success')
+    print_status(f"Output directory: {processor.output_dir}", 'info')
+
+    if config.auto_upload:
+        if failed_uploads:
+            print_status(f"{failed_uploads} file(s) failed to upload to Google Drive", 'error')
+        else:
+            print_status("All files uploaded to Google Drive", 'success')
+
+    print(f"\n{Colors.OKGREEN}{Colors.BOLD}All done! 🎉{Colors.ENDC}\n")
+
+
+async def _process_all(processor: AudioProcessor, script_files: list, reference_audio_path: Path,
+                       reference_text: str, config: PipelineConfig, max_concurrent: int) -> list:
+    """Run process_script for every script with bounded concurrency, reporting in order"""
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+    async def process_one(i: int, script_file: Path) -> list:
+        async with semaphore:
+            print_header(f"Processing Script {i}/{len(script_files)}: {script_file.name}")
+            return await asyncio.to_thread(
+                processor.process_script,
                 script_file,
                 reference_audio_path,
                 reference_text,
-                upload_to_drive=config.get('auto_upload', True),
-                drive_folder_id=config.get('output_folder_id')
+                upload_to_drive=config.auto_upload,
+                drive_folder_id=config.output_folder_id
             )
+
+    pending = {
+        i: asyncio.ensure_future(process_one(i, script_file))
+        for i, script_file in enumerate(script_files, 1)
+    }
+
+    # Drain in submission order so results are reported script by script
+    all_generated_files = []
+    for i, script_file in enumerate(script_files, 1):
+        try:
+            generated_files = await pending[i]
             all_generated_files.extend(generated_files)
             print_status(f"Script {i} complete: {len(generated_files)} files generated", 'success')
 
@@ -176,39 +473,127 @@ def run_pipeline(config: dict, base_dir: Path):
             print_status(f"Failed to process {script_file.name}: {str(e)}", 'error')
             continue
 
-    # Final summary
-    print_header("Pipeline Complete!")
-    print_status(f"Total scripts processed: {len(script_files)}", 'success')
-    print_status(f"Total audio files generated: {len(all_generated_files)}", 'success')
-    print_status(f"Output directory: {processor.output_dir}", 'info')
+    return all_generated_files
 
-    if config.get('auto_upload', True):
-        print_status("All files uploaded to Google Drive", 'success')
 
-    print(f"\n{Colors.OKGREEN}{Colors.BOLD}All done! 🎉{Colors.ENDC}\n")
+def serve(base_dir: Path, socket_path: str = SOCKET_PATH,
+          processor_options: Optional[dict] = None):
+    """Keep models loaded and run pipeline jobs received over a Unix socket"""
+    print_header("F5-TTS Pipeline Server")
+    _prepare_state(base_dir, preload=True, processor_options=processor_options)
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(1)
+    print_status(f"Listening on {socket_path}", 'success')
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    # One JSON request per connection (a config path, or an inline
+                    # config); job output streams back
+                    request = _json_loads(conn.makefile('rb').readline())
+                    output = conn.makefile('w', encoding='utf-8', buffering=1)
+                except (OSError, ValueError) as e:
+                    print_status(f"Bad job request: {str(e)}", 'error')
+                    continue
+
+                print_status("Job received", 'info')
+                with output, contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                    try:
+                        if 'config_path' in request:
+                            # Memoized: unchanged config files are not re-parsed per job
+                            config = load_config(Path(request['config_path']))
+                        else:
+                            config = request
+                        run_pipeline(config, base_dir)
+                    except SystemExit:
+                        pass
+                    except Exception as e:
+                        print_status(f"Pipeline failed: {str(e)}", 'error')
+                print_status("Job finished", 'success')
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def send_job(config_path: Path, socket_path: str = SOCKET_PATH):
+    """Ask a running --server to run a config file and stream its output"""
+    request = {'config_path': str(config_path.resolve())}
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(socket_path)
+    with client:
+        client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        while True:
+            data = client.recv(65536)
+            if not data:
+                break
+            sys.stdout.buffer.write(data)
+            sys.stdout.flush()
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description='Complete F5-TTS Pipeline: Download → Transcribe → Generate → Upload'
+        description='Complete F5-TTS Pipeline: Download → Transcribe → Generate → Upload',
+        epilog='Set F5TTS_CHUNK_SLEEP=<seconds> to pause between generation batches '
+               '(default 0, no pause).'
     )
     parser.add_argument('--config', '-c', type=str, default='config.json',
                        help='Path to config JSON file')
     parser.add_argument('--base-dir', '-b', type=str, default='/workspace/f5tts_project',
                        help='Base directory for project')
+    parser.add_argument('--server', action='store_true',
+                       help='Keep models loaded and serve jobs on --socket')
+    parser.add_argument('--client', action='store_true',
+                       help='Send the config to a running --server instead of running locally')
+    parser.add_argument('--socket', type=str, default=SOCKET_PATH,
+                       help='Unix socket path for --server/--client')
+    parser.add_argument('--batch-size', type=int, default=4,
+                       help='Number of chunks generated per F5-TTS forward pass')
+    parser.add_argument('--nfe-steps', type=int, default=32,
+                       help='F5-TTS ODE solver steps (16 for fast mode)')
+    parser.add_argument('--ode-method', type=str, default='euler',
+                       choices=['euler', 'midpoint'],
+                       help='F5-TTS ODE solver method')
+    parser.add_argument('--no-compile', action='store_true',
+                       help='Run F5-TTS in eager mode instead of torch.compile')
+    parser.add_argument('--bf16', action='store_true',
+                       help='Cast the F5-TTS DiT to BF16 (default: F5-TTS precision, FP16 on CUDA)')
 
     args = parser.parse_args()
 
     config_path = Path(args.config)
     base_dir = Path(args.base_dir)
+    # Generation settings are fixed when the processor is created (once per --server)
+    processor_options = dict(
+        batch_size=args.batch_size,
+        nfe_step=args.nfe_steps,
+        ode_method=args.ode_method,
+        compile_models=not args.no_compile,
+        use_bf16=args.bf16,
+    )
 
     try:
+        if args.server:
+            serve(base_dir, args.socket, processor_options)
+            return
+
         # Load configuration
         config = load_config(config_path)
         print_status(f"Loaded config from: {config_path}", 'success')
 
+        if args.client:
+            send_job(config_path, args.socket)
+            return
+
         # Run pipeline
-        run_pipeline(config, base_dir)
+        run_pipeline(config, base_dir, processor_options)
 
     except KeyboardInterrupt:
         print(f"\n{Colors.WARNING}[WARNING]{Colors.ENDC} Pipeline interrupted by user")
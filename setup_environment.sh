@@ -60,7 +60,7 @@ print_status "Directories created"
 # Install Python packages
 print_info "Installing Python dependencies..."
 pip install -q torch torchaudio --index-url https://download.pytorch.org/whl/cu118
-pip install -q openai-whisper pydrive2 numpy scipy soundfile tqdm librosa
+pip install -q faster-whisper google-api-python-client google-auth-httplib2 numpy scipy soundfile tqdm librosa
 print_status "Python dependencies installed"
 
 # Clone and install F5-TTS
@@ -91,11 +91,11 @@ else
     print_status "credentials.json found"
 fi
 
-if [ ! -f "token.pickle" ]; then
-    print_warning "token.pickle not found!"
-    print_warning "Please upload token.pickle to $PROJECT_DIR"
+if [ ! -f "token.json" ]; then
+    print_warning "token.json not found!"
+    print_warning "Please upload token.json to $PROJECT_DIR"
 else
-    print_status "token.pickle found"
+    print_status "token.json found"
 fi
 
 # Create example config file
@@ -104,7 +104,7 @@ cat > config.json <<EOF
   "input_folder_id": "YOUR_INPUT_FOLDER_ID",
   "output_folder_id": "YOUR_OUTPUT_FOLDER_ID",
   "reference_audio_folder_id": "YOUR_REFERENCE_AUDIO_FOLDER_ID",
-  "whisper_model": "base",
+  "whisper_model": "tiny",
   "chunk_size": 500
 }
 EOF
@@ -115,7 +115,7 @@ echo -e "${GREEN}   Setup completed successfully!${NC}"
 echo -e "${GREEN}================================================${NC}\n"
 
 echo -e "${BLUE}Next steps:${NC}"
-echo "1. Upload credentials.json and token.pickle to: $PROJECT_DIR"
+echo "1. Upload credentials.json and token.json to: $PROJECT_DIR"
 echo "2. Edit config.json with your Google Drive folder IDs"
 echo "3. Run: python google_drive_manager.py download --folder-id YOUR_ID --local-path input/"
 echo "4. Run: python audio_processor.py --reference-audio input/reference_audio/your_audio.wav --script input/scripts/your_script.txt"
@@ -1,7 +1,7 @@
 #!/usr/bin/env node
 /**
  * Automatic Google Drive Token Server
- * Runs in background, automatically refreshes token from token.pickle
+ * Runs in background, automatically refreshes token from token.json
  * NO manual steps needed!
  */
 
@@ -21,37 +21,39 @@ let cachedToken = null;
 let tokenExpiry = null;
 
 /**
- * Get token from token.pickle using Python
+ * Get token from token.json using Python
  */
-function getTokenFromPickle() {
+function getTokenFromFile() {
   return new Promise((resolve, reject) => {
     const pythonScript = `
-import pickle
+import json
 import os
 import sys
 
+from google.oauth2.credentials import Credentials
+
 try:
     from google.auth.transport.requests import Request
     CAN_REFRESH = True
 except ImportError:
     CAN_REFRESH = False
 
-TOKEN_PICKLE = 'token.pickle'
+TOKEN_JSON = 'token.json'
 
-if not os.path.exists(TOKEN_PICKLE):
-    print('ERROR:token.pickle not found', file=sys.stderr)
+if not os.path.exists(TOKEN_JSON):
+    print('ERROR:token.json not found', file=sys.stderr)
     sys.exit(1)
 
 try:
-    with open(TOKEN_PICKLE, 'rb') as f:
-        creds = pickle.load(f)
+    with open(TOKEN_JSON) as f:
+        creds = Credentials.from_authorized_user_info(json.load(f))
 
     # Auto-refresh if needed
     if CAN_REFRESH and creds:
         if not creds.valid and creds.expired and creds.refresh_token:
             creds.refresh(Request())
-            with open(TOKEN_PICKLE, 'wb') as f:
-                pickle.dump(creds, f)
+            with open(TOKEN_JSON, 'w') as f:
+                f.write(creds.to_json())
 
     print(creds.token)
 except Exception as e:
@@ -94,7 +96,7 @@ async function getToken() {
 
   // Fetch fresh token
   try {
-    const token = await getTokenFromPickle();
+    const token = await getTokenFromFile();
     cachedToken = token;
     tokenExpiry = now + (55 * 60 * 1000); // Cache for 55 minutes
     return token;
@@ -118,7 +120,7 @@ app.get('/token', async (req, res) => {
     res.status(500).json({
       success: false,
       error: error.message,
-      message: 'Make sure token.pickle exists in the project folder'
+      message: 'Make sure token.json exists in the project folder'
     });
   }
 });
@@ -148,14 +150,16 @@ app.get('/refresh', async (req, res) => {
  * API Endpoint: Health check
  */
 app.get('/health', (req, res) => {
-  const tokenPickleExists = fs.existsSync(path.join(__dirname, 'token.pickle'));
+  const tokenFileExists = fs.existsSync(path.join(__dirname, 'token.json'));
   res.json({
     status: 'running',
-    tokenPickleExists,
+    tokenFileExists,
+    // Kept for existing clients of /health; same value as tokenFileExists
+    tokenPickleExists: tokenFileExists,
     hasCachedToken: !!cachedToken,
-    message: tokenPickleExists
-      ? 'Token server running, token.pickle found'
-      : 'Token server running, but token.pickle not found'
+    message: tokenFileExists
+      ? 'Token server running, token.json found'
+      : 'Token server running, but token.json not found'
   });
 });
 
@@ -168,12 +172,12 @@ app.listen(PORT, () => {
   console.log(`✓ Token endpoint: http://localhost:${PORT}/token`);
   console.log(`✓ Health check: http://localhost:${PORT}/health`);
 
-  // Check if token.pickle exists
-  if (fs.existsSync(path.join(__dirname, 'token.pickle'))) {
-    console.log('\n✅ token.pickle found - ready to serve tokens!');
+  // Check if token.json exists
+  if (fs.existsSync(path.join(__dirname, 'token.json'))) {
+    console.log('\n✅ token.json found - ready to serve tokens!');
   } else {
-    console.log('\n⚠️  WARNING: token.pickle not found in project folder');
-    console.log('   Please add token.pickle to use Google Drive upload');
+    console.log('\n⚠️  WARNING: token.json not found in project folder');
+    console.log('   Please add token.json to use Google Drive upload');
   }
 
   console.log('\n💡 This server runs automatically with npm run dev');
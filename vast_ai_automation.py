@@ -15,6 +15,8 @@ Usage:
 
 import os
 import sys
+import hashlib
+import importlib.util
 import subprocess
 import time
 from pathlib import Path
@@ -31,6 +33,27 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Plain output when redirected to a log file or when NO_COLOR is set
+if os.environ.get('NO_COLOR') or not sys.stdout.isatty():
+    for _name in [k for k in vars(Colors) if k.isupper()]:
+        setattr(Colors, _name, '')
+
+# CUDA 11.8 builds of torch/torchaudio
+TORCH_INDEX_URL = "https://download.pytorch.org/whl/cu118"
+
+PYTHON_PACKAGES = [
+    "torch",
+    "torchaudio",
+    "faster-whisper",
+    "google-api-python-client",
+    "google-auth-httplib2",
+    "numpy",
+    "scipy",
+    "soundfile",
+    "tqdm",
+    "librosa",
+]
+
 def print_status(message, status='info'):
     """Print colored status messages"""
     if status == 'info':
@@ -47,23 +70,29 @@ def print_status(message, status='info'):
         print(f"{Colors.HEADER}{Colors.BOLD}{'='*60}{Colors.ENDC}\n")
 
 def run_command(command, description, check=True, shell=True):
-    """Run a shell command with error handling"""
+    """Run a shell command, streaming its output line by line"""
     print_status(f"{description}...", 'info')
     try:
-        result = subprocess.run(
+        process = subprocess.Popen(
             command,
             shell=shell,
-            check=check,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
         )
-        if result.stdout:
-            print(result.stdout)
+        for line in process.stdout:
+            sys.stdout.write(line)
+            # stdout is block-buffered when redirected to a log file
+            sys.stdout.flush()
+        process.wait()
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command)
         print_status(f"{description} completed", 'success')
         return True
     except subprocess.CalledProcessError as e:
-        print_status(f"{description} failed: {e.stderr}", 'error')
+        print_status(f"{description} failed (exit code {e.returncode})", 'error')
         if check:
             sys.exit(1)
         return False
@@ -100,29 +129,26 @@ def install_system_dependencies():
         run_command(cmd, desc)
 
 def install_python_dependencies():
-    """Install Python packages"""
+    """Install Python packages; returns True if the install succeeded"""
     print_status("Installing Python dependencies", 'header')
 
-    packages = [
-        "torch torchaudio --index-url https://download.pytorch.org/whl/cu118",
-        "openai-whisper",
-        "pydrive2",
-        "numpy",
-        "scipy",
-        "soundfile",
-        "tqdm",
-        "librosa",
-    ]
+    # uv resolves and fetches wheels in parallel; used for every install below
+    run_command("PIP_DISABLE_PIP_VERSION_CHECK=1 pip install uv", "Installing uv")
 
-    for package in packages:
-        run_command(
-            f"pip install {package}",
-            f"Installing {package.split()[0]}",
-            check=False  # Don't exit if one fails
-        )
+    # One install transaction: the resolver runs once and wheels download together
+    requirements_file = Path('/tmp/f5tts_requirements.txt')
+    requirements_file.write_text("\n".join(PYTHON_PACKAGES) + "\n")
+
+    # unsafe-best-match keeps pip's behaviour of picking across both indexes
+    return run_command(
+        f"uv pip install --system --index-strategy unsafe-best-match "
+        f"--extra-index-url {TORCH_INDEX_URL} -r {requirements_file}",
+        "Installing Python packages",
+        check=False  # Don't exit if install fails
+    )
 
 def install_f5tts(base_dir):
-    """Clone and install F5-TTS"""
+    """Clone and install F5-TTS; returns True if every install step succeeded"""
     print_status("Installing F5-TTS", 'header')
 
     f5tts_dir = base_dir / 'F5-TTS'
@@ -130,32 +156,33 @@ def install_f5tts(base_dir):
     if f5tts_dir.exists():
         print_status("F5-TTS already exists, updating...", 'warning')
         run_command(
-            f"cd {f5tts_dir} && git pull",
+            f"cd {f5tts_dir} && git fetch --depth=1 origin HEAD && git reset --hard FETCH_HEAD",
             "Updating F5-TTS"
         )
     else:
         run_command(
-            f"git clone https://github.com/SWivid/F5-TTS.git {f5tts_dir}",
+            f"git clone --depth=1 --single-branch https://github.com/SWivid/F5-TTS.git {f5tts_dir}",
             "Cloning F5-TTS repository"
         )
 
     # Install F5-TTS requirements
+    ok = True
     requirements_file = f5tts_dir / 'requirements.txt'
     if requirements_file.exists():
-        run_command(
-            f"pip install -r {requirements_file}",
+        ok = run_command(
+            f"uv pip install --system -r {requirements_file}",
             "Installing F5-TTS requirements",
             check=False
         )
 
     # Install F5-TTS as package
-    run_command(
-        f"cd {f5tts_dir} && pip install -e .",
+    ok = run_command(
+        f"cd {f5tts_dir} && uv pip install --system -e .",
         "Installing F5-TTS package",
         check=False
-    )
+    ) and ok
 
-    return f5tts_dir
+    return ok
 
 def setup_google_drive(base_dir):
     """Setup Google Drive authentication"""
@@ -163,7 +190,7 @@ def setup_google_drive(base_dir):
 
     # Check if credentials files exist
     creds_file = base_dir / 'credentials.json'
-    token_file = base_dir / 'token.pickle'
+    token_file = base_dir / 'token.json'
 
     if not creds_file.exists():
         print_status("credentials.json not found!", 'error')
@@ -171,13 +198,36 @@ def setup_google_drive(base_dir):
         sys.exit(1)
 
     if not token_file.exists():
-        print_status("token.pickle not found!", 'error')
-        print_status("Please upload token.pickle to /workspace/f5tts_project/", 'warning')
+        print_status("token.json not found!", 'error')
+        print_status("Please upload token.json to /workspace/f5tts_project/", 'warning')
         sys.exit(1)
 
     print_status("Google Drive credentials found", 'success')
     return True
 
+def setup_fingerprint(f5tts_dir):
+    """Hash of the package list and F5-TTS commit, or None if F5-TTS is not cloned"""
+    try:
+        commit = subprocess.check_output(
+            ['git', '-C', str(f5tts_dir), 'rev-parse', 'HEAD'],
+            stderr=subprocess.DEVNULL
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    packages = "\n".join(PYTHON_PACKAGES + [TORCH_INDEX_URL]).encode()
+    return hashlib.sha256(packages + commit).hexdigest()
+
+def is_setup_current(base_dir, f5tts_dir):
+    """True when a previous run already provisioned this exact environment"""
+    fingerprint_file = base_dir / '.setup_fingerprint'
+    fingerprint = setup_fingerprint(f5tts_dir)
+    if fingerprint is None or not fingerprint_file.exists():
+        return False
+    if importlib.util.find_spec('f5_tts') is None:
+        return False
+    return fingerprint_file.read_text().strip() == fingerprint
+
 def main():
     """Main execution flow"""
     print_status("F5-TTS Automation Script Started", 'header')
@@ -186,22 +236,35 @@ def main():
     try:
         # Step 1: Setup directories
         base_dir = setup_directories()
+        f5tts_dir = base_dir / 'F5-TTS'
+
+        if is_setup_current(base_dir, f5tts_dir):
+            # Persistent volume already provisioned with the same packages and F5-TTS commit
+            print_status("Environment already set up, skipping installation", 'success')
+        else:
+            # Step 2: Install system dependencies
+            install_system_dependencies()
 
-        # Step 2: Install system dependencies
-        install_system_dependencies()
+            # Step 3: Install Python dependencies
+            packages_ok = install_python_dependencies()
 
-        # Step 3: Install Python dependencies
-        install_python_dependencies()
+            # Step 4: Install F5-TTS
+            f5tts_ok = install_f5tts(base_dir)
 
-        # Step 4: Install F5-TTS
-        f5tts_dir = install_f5tts(base_dir)
+            # Only a fully successful setup may be skipped next time
+            fingerprint = setup_fingerprint(f5tts_dir)
+            if packages_ok and f5tts_ok and fingerprint:
+                (base_dir / '.setup_fingerprint').write_text(fingerprint)
+            else:
+                (base_dir / '.setup_fingerprint').unlink(missing_ok=True)
+                print_status("Some installs failed; setup will run again next time", 'warning')
 
         # Step 5: Setup Google Drive
         setup_google_drive(base_dir)
 
         print_status("Setup completed successfully!", 'header')
         print_status("Next steps:", 'info')
-        print_status("1. Ensure credentials.json and token.pickle are in /workspace/f5tts_project/", 'info')
+        print_status("1. Ensure credentials.json and token.json are in /workspace/f5tts_project/", 'info')
         print_status("2. Run: python google_drive_manager.py download", 'info')
         print_status("3. Run: python audio_processor.py", 'info')
 